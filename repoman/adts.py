@@ -1,5 +1,5 @@
 # All Abstract Data Types used in RepoMan
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 
@@ -12,13 +12,13 @@ class SortOrderChoices(Enum):
     rank    = "rank"
     suffix  = "suffix"
 
-SORT_ORDER_CHOICES = ', '.join([enum for enum in SortOrderChoices.__members__])
+SORT_ORDER_CHOICES = ', '.join(SortOrderChoices.__members__)
 
 
 @dataclass
 class QueryCommandParameters:
     """Keep track of query parameters"""
-    query_string : str
+    query_string : str = ""
     suffix       : str = ""
     sort_order   : str = "lastmod"
 
@@ -26,8 +26,8 @@ class QueryCommandParameters:
 @dataclass
 class IndexCommandParameters:
     """Keep track of index command parameters"""
-    root   : str(Path.home())
-    suffix : str
+    root   : str = field(default_factory=lambda: str(Path.home()))
+    suffix : str = ""
     force  : str = "no"
     verbose: str = "no"
 
@@ -35,6 +35,10 @@ class IndexCommandParameters:
 @dataclass
 class QueryResult:
     """Composite information on each document returned from a query"""
+    # One of these per query hit, so skip the per-instance __dict__
+    # (explicit as we still support 3.9, ie. no dataclass(slots=True)).
+    __slots__ = ("doc_id", "rank", "name", "path_full", "path_rel", "suffix", "last_mod", "snippet")
+
     doc_id    : int
     rank      : str
     name      : str
@@ -1,20 +1,22 @@
 #!/usr/bin/env py
+import pkgutil
+import threading
+from functools import lru_cache
 from importlib import import_module
 from pathlib import Path
 from types import ModuleType
-from typing import Optional
+from typing import TYPE_CHECKING, Callable, Optional
 
 import click
-from prompt_toolkit import PromptSession, prompt
-from prompt_toolkit.history import FileHistory
-from pyfiglet import Figlet
-from rich.console import Console
 
 import constants as c
 import db_physical as dbp
 import db_operations as dbo
 from utils import get_user_history_path
 
+if TYPE_CHECKING:
+    from rich.console import Console  # Typing (imported in cli(), not needed for --help)
+
 ################################################################################
 # Primary CLI/UI for RepoMan!
 ################################################################################
@@ -23,18 +25,19 @@ from utils import get_user_history_path
 @click.option('--verbose/--no-verbose', default=False, help='Verbose mode?')
 def cli(verbose: bool, query: Optional[str]) -> None:
 
+    from rich.console import Console
     console = Console()
 
     # If we have a query to run from the command-line, do it,
     # otherwise, put out the regular introductory banner.
     if query:
         with dbp.database.connection_context() as ctx:
-            message_or_none = get_command_method('query')(console, query_string=query)
+            message_or_none = get_query_command()(console, query_string=query)
             if message_or_none:
                 console.print(message_or_none)
     else:
         console.clear()
-        print(Figlet(font='standard').renderText('Repo-Man'))
+        print(c.BANNER)
         console.print(c.INTRODUCTION)
         with dbp.database.connection_context() as ctx:
             status = dbo.status()
@@ -42,46 +45,70 @@ def cli(verbose: bool, query: Optional[str]) -> None:
                 console.print(f"[bold italic]{status.total_docs:,d}[/bold italic] documents to query from.\n")
 
     # Setup our prompt session allow commands over sessions (!)
-    session = PromptSession(history=FileHistory(get_user_history_path()))
+    session = get_prompt_session()
+
+    # Queries are the most likely first entry, load the query command while the user's typing.
+    if QUERY_COMMAND is None:
+        threading.Thread(target=get_query_command, daemon=True).start()
+
+    # Hold a single database connection open for the life of the REPL.
+    with dbp.database.connection_context() as ctx:
+        while True:
+            try:
+                response = session.prompt(c.PROMPT)
+            except (KeyboardInterrupt, EOFError):
+                console.print("[italic]Goodbye![/]")
+                break
+
+            # Done? (only lower-case what could possibly be an exit command)
+            if len(response) <= c.EXIT_COMMAND_MAX_LEN and response.lower() in c.EXIT_COMMANDS:
+                console.print("[italic]Goodbye![/]")
+                break
+
+            if response:  # As Ahhhnold would say...DOO EET!
+                # (any nested connection_context, e.g. from indexing, closes the
+                #  connection on exit so make sure it's open before every command)
+                dbp.database.connect(reuse_if_open=True)
+                execute(verbose, console, response)
 
-    while True:
-        try:
-            response = session.prompt(c.PROMPT)
-        except (KeyboardInterrupt, EOFError):
-            console.print("[italic]Goodbye![/]")
-            break
 
-        if response.lower() in (".exit",):  # Done?
-            console.print("[italic]Goodbye![/]")
-            break
+@lru_cache(maxsize=1)
+def get_prompt_session():
+    """Build our prompt session (and load its history) once per process."""
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.history import ThreadedHistory
+    from cli_utils import BufferedFileHistory
+    return PromptSession(history=ThreadedHistory(BufferedFileHistory(get_user_history_path())))
 
-        if response:  # As Ahhhnold would say...DOO EET!
-            with dbp.database.connection_context() as ctx:
-                execute(verbose, console, response)
 
-
-def execute(verbose: bool, console: Console, response: str) -> bool:
+def execute(verbose: bool, console: "Console", response: str) -> bool:
     """Execute the "response" provided, determining whether or not
     it's a "command" or "simply" a query to be executed."""
+    if handler := EXECUTE_DISPATCH.get(response[:1]):
+        handler(verbose, console, response[1:])
+    else:
+        _execute_query(verbose, console, response)
+    return True
+
 
-    if response.startswith('.'):
-        ##########################################################
-        # A non-query repoman command
-        ##########################################################
-        command = response[1:]
-        command_method = get_command_method(command)
-        if command_method:
-            result = command_method(console, verbose=verbose)
-        else:
-            console.print(f"Sorry, [red bold]{response}[/red bold] is not a known command (.help to list them)")
+def _execute_command(verbose: bool, console: "Console", command: str) -> None:
+    """A non-query repoman command (ie. ".<command>")"""
+    command_method = get_command_method(command)
+    if command_method:
+        command_method(console, verbose=verbose)
     else:
-        ##########################################################
-        # A query (either short or "advanced")
-        ##########################################################
-        query_string = None if response.lower() == '.q' else response
-        get_command_method('query')(console, query_string=query_string)
+        console.print(f"Sorry, [red bold].{command}[/red bold] is not a known command (.help to list them)")
 
-    return True
+
+def _execute_query(verbose: bool, console: "Console", query_string: str) -> None:
+    """A query (either short or "advanced")"""
+    (QUERY_COMMAND or get_query_command())(console, query_string=query_string)
+
+
+# Leading character of a response -> how to execute it (anything else is a query).
+EXECUTE_DISPATCH = {
+    '.': _execute_command,
+}
 
 
 ################################################################################
@@ -89,26 +116,65 @@ def execute(verbose: bool, console: Console, response: str) -> bool:
 # auto-discovery of new commands
 ################################################################################
 COMMAND_MODULES = dict()
+COMMAND_ALIASES = dict(
+    q = "query",
+)
+COMMAND_PREFIXES = dict()   # Unambiguous prefix -> command name, eg. "st" -> "status"
+
 def populate_command_modules_cache() -> None:
+    """Record the names of all command modules available, importing
+    each one is deferred until first use (see get_module_for_command)."""
     global COMMAND_MODULES
+    if COMMAND_MODULES:
+        return  # Already done, don't throw away any modules already imported.
     commands_path = Path(__file__).parent / Path("cli_commands")
-    for path_ in commands_path.glob("*.py"):
-        if not path_.stem.startswith('__'):  # Skip "__init__.py"
-            COMMAND_MODULES[path_.stem] = import_module(f"cli_commands.{path_.stem}")
+    for module_info in pkgutil.iter_modules([str(commands_path)]):
+        if not module_info.name.startswith('__'):
+            COMMAND_MODULES[module_info.name] = None
+
+    # Allow any command to be abbreviated, as long as it's unambiguous (but a
+    # full command name always refers to itself, even if a prefix of another).
+    for name in COMMAND_MODULES:
+        for end in range(1, len(name)):
+            prefix = name[:end]
+            COMMAND_PREFIXES[prefix] = None if prefix in COMMAND_PREFIXES else name
+    for name in COMMAND_MODULES:
+        COMMAND_PREFIXES[name] = name
 
 populate_command_modules_cache()
 
 
-def get_command_method(command: str) -> callable:
+def get_module_for_command(command: str) -> Optional[ModuleType]:
+    command = COMMAND_ALIASES.get(command) or COMMAND_PREFIXES.get(command) or command
     module_ = COMMAND_MODULES.get(command, None)
+    if module_ is None and command in COMMAND_MODULES:
+        module_ = import_module(f"cli_commands.{command}")
+        COMMAND_MODULES[command] = module_
+    return module_
+
+
+@lru_cache(maxsize=None)  # Safe, the set of commands is fixed once populated.
+def get_command_method(command: str) -> Optional[Callable]:
+    module_ = get_module_for_command(command)
     if module_:
         return module_.command
     return None
 
+QUERY_COMMAND = None
+def get_query_command() -> Callable:
+    """Queries are by far our most common command, resolve it once and keep it."""
+    global QUERY_COMMAND
+    if QUERY_COMMAND is None:
+        QUERY_COMMAND = get_command_method('query')
+    return QUERY_COMMAND
+
+
 def get_command_modules() -> dict[str, ModuleType]:
+    # Callers want *all* the modules (e.g. help), so resolve any not yet imported.
+    for command in COMMAND_MODULES:
+        get_module_for_command(command)
     return COMMAND_MODULES
 
 
-
 if __name__ == "__main__":
     cli()
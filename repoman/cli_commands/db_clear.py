@@ -2,6 +2,7 @@ from rich.console import Console
 from rich.prompt import Confirm
 
 import db_logical as dbl
+import db_operations as dbo
 
 
 def command(console: Console, verbose: bool) -> None:
@@ -11,4 +12,5 @@ def command(console: Console, verbose: bool) -> None:
     """
     if Confirm.ask("Are you sure?", default=False):
         dbl.clear()
+        dbo.clear_query_cache()
         console.print(f"Database [bold]cleared[/bold].")
@@ -1,6 +1,7 @@
 from rich.console import Console
 from rich.prompt import Confirm
 
+import db_operations as dbo
 import db_physical as dbp
 
 
@@ -11,4 +12,5 @@ def command(console: Console, verbose: bool) -> None:
     """
     if Confirm.ask("Are you sure?", default=False):
         dbp.drop()
+        dbo.clear_query_cache()
         console.print(f"Database [bold]dropped[/bold].")
@@ -1,49 +1,59 @@
 import re
-import sys
-import inspect
-from textwrap import dedent
+from functools import lru_cache
 
 from rich.console import Console
-from rich.table import Table
+from rich.text import Text
 
-import constants as c
 from cli import get_command_modules
 
+# Our command docstrings are "<field>: <value>" lines, eg. "description: Do it."
+DOCSTRING_FIELD_RE = re.compile(r"^\s*(command|description):\s*(.*?)\s*$", re.MULTILINE)
+
+
 def command(console: Console, verbose: bool):
     """
     command: __name__
     description: Display the list of all RepoMan commands available.
     """
-    # Display the list of all commands available by finding all the
-    # methods in this module that start with "command_" and using
-    # their doc-strings as the "help" text for their operation.
-    def parse_docstring(module, docstring: str) -> tuple[str, str]:
-        """Parse the docstring and get the command invocation and description"""
-        command, description = "", ""
-        for line in docstring.split("\n"):
-            if "command:" in line.strip():
-                command += line.split(":")[1].strip()
-                if command == '__name__':
-                    command = module.__name__.replace("cli_commands", "")
-
-            if "description:" in line.strip():
-                description += line.split(":")[1].strip()
-        return (command, description)
+    console.print(get_help_text())
+
+
+@lru_cache(maxsize=1)
+def get_help_text() -> Text:
+    """Render our help once, the commands available can't change within a session."""
+    commands = get_command_help()
+    left_column_width = max([len(command) for command, _ in commands]) + 1
+
+    lines = [
+        "All entries that don't start with '.' are consider queries.\n",
+        "Entries start with '.' are [italic]repoman[/] commands (any unambiguous prefix will do):",
+    ]
+    for (command, description) in commands:
+        lines.append(f"[bold]{command:{left_column_width}s}[/] {description}")
 
+    # lines.append("\nEntries start with '!' are [italic]document[/] commands:")
+    # lines.append(f"[bold]{'!<i>':{left_column_width}s}[/] Open the file associated with the number from the last query.\n")
+    return Text.from_markup("\n".join(lines))
+
+
+@lru_cache(maxsize=1)
+def get_command_help() -> tuple[tuple[str, str], ...]:
+    """Return the sorted (command, description) of all commands available by
+    finding the "command" method in each command module and using their
+    doc-strings as the "help" text for their operation.
+
+    (cached as the set of commands can't change within a session)
+    """
     commands = []
     for module in get_command_modules().values():
-        for name, func in inspect.getmembers(module):
-            if name != 'command':
-                continue
-            (command, description) = parse_docstring(module, func.__doc__)
-            commands.append((command, description))
-
-    console.print("All entries that don't start with '.' are consider queries.\n")
+        commands.append(parse_docstring(module, module.command.__doc__))
+    return tuple(sorted(commands))
 
-    console.print("Entries start with '.' are [italic]repoman[/] commands:")
-    left_column_width = max([len(command) for command, _ in commands]) + 1
-    for (command, description) in sorted(commands):
-        console.print(f"[bold]{command:{left_column_width}s}[/] {description}")
 
-    # console.print("\nEntries start with '!' are [italic]document[/] commands:")
-    # console.print(f"[bold]{'!<i>':{left_column_width}s}[/] Open the file associated with the number from the last query.\n")
+def parse_docstring(module, docstring: str) -> tuple[str, str]:
+    """Parse the docstring and get the command invocation and description"""
+    fields = dict(DOCSTRING_FIELD_RE.findall(docstring))
+    command = fields.get("command", "")
+    if command == '__name__':
+        command = module.__name__.replace("cli_commands", "")
+    return (command, fields.get("description", ""))
@@ -1,15 +1,19 @@
+import os
 from functools import partial
-from pathlib import Path
 
-from prompt_toolkit import prompt
 from prompt_toolkit.completion import PathCompleter
 from rich.console import Console
 from rich.table import Table
 
 import constants as c
+import db_operations as dbo
 from cli_utils import get_state, save_state, YesNoValidator, PathValidator, sub_prompt
 from index import index, cleanup
-from utils import get_user_history_path
+
+# Our prompt completer & validators are stateless, no need to create them on every command.
+ROOT_COMPLETER = PathCompleter(expanduser=True, only_directories=True)
+ROOT_VALIDATOR = PathValidator()
+YES_NO_VALIDATOR = YesNoValidator()
 
 
 def command(console: Console, verbose: bool) -> bool:
@@ -25,12 +29,12 @@ def command(console: Console, verbose: bool) -> bool:
     ############################################################
     # Using these as defaults, prompt for any updated values
     ############################################################
-    # Root directory to index from..
-    index_parms.root = _sub_prompt(
+    # Root directory to index from (expanded once here, so it's saved that way too)..
+    index_parms.root = os.path.expanduser(_sub_prompt(
         'Root',
         index_parms.root,
-        completer=PathCompleter(only_directories=True),
-        validator=PathValidator())
+        completer=ROOT_COMPLETER,
+        validator=ROOT_VALIDATOR))
 
     # What file suffix to index (if any)
     index_parms.suffix = _sub_prompt(
@@ -41,13 +45,13 @@ def command(console: Console, verbose: bool) -> bool:
     index_parms.force = _sub_prompt(
         'Force (y/n)',
         index_parms.force,
-        validator=YesNoValidator())
+        validator=YES_NO_VALIDATOR)
 
     # Should we overwrite existing entries?
     index_parms.verbose = _sub_prompt(
         'Verbose (y/n)',
         index_parms.verbose,
-        validator=YesNoValidator())
+        validator=YES_NO_VALIDATOR)
 
     # Save away these values for the next time we run this command.
     save_state("index", index_parms)
@@ -60,6 +64,9 @@ def command(console: Console, verbose: bool) -> bool:
     # Cleanup any documents in the database that no longer appear on disk.
     num_cleansed = cleanup()
 
+    # Any queries we've cached may no longer reflect what's indexed.
+    dbo.clear_query_cache()
+
     # Print a nice summary of what we did (based on what occurred)
     table = Table(show_header=False, box=c.DEFAULT_BOX_STYLE)
     table.add_column("-")
@@ -17,6 +17,7 @@ def command(console: Console, verbose: bool) -> None:
         table = Table(show_header=True, show_footer=True, box=c.DEFAULT_BOX_STYLE)
         table.add_column("Tag")
         table.add_column("Documents")
-        for obj in link_counts:
-            table.add_row(obj.url, f"{obj.count:,d}")
+        rows = [(obj.url, f"{obj.count:,d}") for obj in link_counts]
+        for row in rows:
+            table.add_row(*row)
         console.print(table)
@@ -1,24 +1,32 @@
+import heapq
 import os
-from contextlib import suppress
+import subprocess
+import sys
 from functools import partial
+from operator import attrgetter
 from pathlib import Path
 
-from prompt_toolkit import prompt
 from rich.console import Console # Typing
-from rich.markup import escape
 from rich.prompt import Prompt
 from rich.table import Table
-from typing import Optional, Tuple
+from rich.text import Text
+from typing import Optional
 
 import constants as c
 import db_operations as dbo
-from db_logical import Document
 from cli_utils import get_state, save_state, update_state, SortOrderValidator, IntValidator, sub_prompt
 from utils import humanify_size
 from adts import QueryCommandParameters, SortOrderChoices, QueryResult
 
 
-LAST_QUERY_RESULTS = None
+LAST_QUERY_RESULTS = None     # Doc ids (only) of the last query's results, in display order.
+
+# Style that matching text in query snippets is displayed with.
+SNIPPET_STYLE = "green bold"
+
+# (stateless, no need to create it on every command)
+SORT_ORDER_VALIDATOR = SortOrderValidator()
+
 
 def command(
         console: Console,
@@ -51,9 +59,10 @@ def command(
 
     # DO our query based on the specified query parameters available!
     if results := dbo.query(query_parms):
-        results = _sort_filter_results(query_parms, results)
-        message_or_none = _display_query_results(console, results)
-        LAST_QUERY_RESULTS = results
+        num_not_shown = max(len(results) - c.MAX_QUERY_RESULTS, 0)
+        results = _sort_results(query_parms, results, c.MAX_QUERY_RESULTS)
+        message_or_none = _display_query_results(console, results, num_not_shown)
+        LAST_QUERY_RESULTS = [result.doc_id for result in results]
         return message_or_none
 
     LAST_QUERY_RESULTS = None
@@ -69,91 +78,75 @@ def get_query_parms(console: Console, query_parms: QueryCommandParameters) -> Qu
 
     query_parms.query_string = _sub_prompt(  # What query string?
         'Query',
-        getattr(query_parms, 'query_string', query_parms.query_string))
+        query_parms.query_string)
 
     query_parms.suffix = _sub_prompt(  # Limit to a particular suffix?
         'File Suffix',
-        getattr(query_parms, "suffix", query_parms.suffix))
+        query_parms.suffix)
 
     query_parms.sort_order = _sub_prompt(  # What order to return results?
         'Sort Order',
-        getattr(query_parms, "sort_order", query_parms.sort_order),
-        validator=SortOrderValidator())
+        query_parms.sort_order,
+        validator=SORT_ORDER_VALIDATOR)
 
     return query_parms
 
 
-def _sort_filter_results(query_parms: QueryCommandParameters, results: list[QueryResult]) -> list[QueryResult]:
-
-    def filter_results_by_suffix(query_parms: QueryCommandParameters, results: list[QueryResult]) -> list[QueryResult]:
-        if query_parms.suffix:
-            results = list(filter(
-                lambda doc: doc.suffix.lower() == query_parms.suffix.lower(),
-                results))
-        return results
-
-    def sort_results(query_parms: QueryCommandParameters, results: list[QueryResult]) -> list[QueryResult]:
-        """Return a set of results but sorted based on the respective
-        attribute from the query_parms.
-        """
-        # Reverse order?
-        reverse = True if query_parms.sort_order.startswith("-") else False
-
-        # By what attribute?
-        order_by_attribute = SortOrderChoices[query_parms.sort_order.replace("-", "")].value
+def _sort_results(query_parms: QueryCommandParameters, results: list[QueryResult], limit: int) -> list[QueryResult]:
+    """Return (at most limit of) the results sorted based on the respective
+    attribute from the query_parms (suffix filtering is done by the query itself).
+    """
+    # Reverse order?
+    reverse = True if query_parms.sort_order.startswith("-") else False
 
-        # Do it..
-        results.sort(
-            key=lambda ao_: getattr(ao_, order_by_attribute),
-            reverse=reverse)
+    # By what attribute?
+    key = attrgetter(SortOrderChoices[query_parms.sort_order.replace("-", "")].value)
 
-        return results
+    # Do it..if we can only show some of them, no need to sort all of them.
+    if len(results) > limit:
+        top = heapq.nlargest if reverse else heapq.nsmallest
+        return top(limit, results, key=key)
 
-    results = filter_results_by_suffix(query_parms, results)
-    results = sort_results(query_parms, results)
+    results.sort(key=key, reverse=reverse)
     return results
 
 
-def _display_query_results(console: Console, results: list[QueryResult]) -> Optional[str]:
+def _display_query_results(console: Console, results: list[QueryResult], num_not_shown: int = 0) -> Optional[str]:
 
-    def chunker(lst: list, n: int) -> list:
-        """Yield successive n-sized chunks from lst."""
-        for i in range(0, len(lst), n):
-            yield lst[i:i + n]
+    page_size = console.size.height - 1
 
-    def markup_snippet(snippet):
-        """On our queries, we can't use the Rich markup to delineate matching text,
-        here, we "undo" that and convert to that which'll be displayed to the user.
-        """
-        snippet = escape(snippet)
-        snippet = snippet.replace(">>>", "[green bold]")
-        snippet = snippet.replace("<<<", "[/]")
-        return snippet
+    for start in range(0, len(results), page_size):
+        chunk = results[start:start + page_size]
 
-    ith = 0
+        # Prepare all the cells for this page before handing any of them to Rich.
+        rows = [
+            (
+                f"{row_num:,d}",
+                Text(obj.path_full.name),
+                markup_snippet(obj.snippet),
+                obj.last_mod[:10],           # Don't need time (YYYY-MM-DD only)..
+            )
+            for row_num, obj in enumerate(chunk, start=start+1)
+        ]
 
-    for page, chunk in enumerate(chunker(results, console.size.height-1)):
         table = Table(show_header=True, header_style="bold", box=c.DEFAULT_BOX_STYLE)
-        table.add_column("#")
+        table.add_column("#", justify="right", no_wrap=True)
         table.add_column("Name")
         table.add_column("Snippet")
-        table.add_column("LastMod")
-        for obj in chunk:
-            table.add_row(
-                f"{ith+1:,d}",
-                obj.path_full.name,
-                markup_snippet(obj.snippet),
-                obj.last_mod.split(' ')[0],  # Don't need time..
-            )
-            ith += 1
-        console.clear()
-        console.print(table)
-
-        remaining = len(results) - ith
+        table.add_column("LastMod", no_wrap=True)
+        for row in rows:
+            table.add_row(*row)
+        with console:       # Buffer and write the page out in one go.
+            console.clear()
+            console.print(table)
+
+        remaining = len(results) - start - len(rows)
         if remaining > 0:
             prompt_ = f"[b]{remaining:,d}[/] left; [b]<ith>[/] doc to open; [i]<ret>[/] for next set; [b]q[/] to quit"
         else:
             prompt_ = "[b]<ith>[/] doc to open; [b]q[/] to quit"
+            if num_not_shown:
+                prompt_ = f"[b]{num_not_shown:,d}[/] more not shown (refine query); {prompt_}"
 
         try:
             # Use Rich's prompt here to be able to take advantage of formatting
@@ -167,33 +160,63 @@ def _display_query_results(console: Console, results: list[QueryResult]) -> Opti
         if next_.lower().startswith("q"):
             return None
 
-        # If the response is an integer, open the respective document path
+        # If the response is (a valid) integer, open the respective document
         try:
-            return open_file(console, results[int(next_)-1].doc_id)
+            ith_doc = int(next_)
         except ValueError:
             continue
+        if 1 <= ith_doc <= len(results):
+            return open_file(console, results[ith_doc-1])
+
+
+def markup_snippet(snippet: str) -> Text:
+    """On our queries, we can't use the Rich markup to delineate matching text,
+    here, we "undo" that and convert to that which'll be displayed to the user
+    (directly as Text, so Rich doesn't have to parse any markup per cell).
+    """
+    unmatched, *matches = snippet.split(c.SNIPPET_START)
+    text = Text(unmatched)
+    for match in matches:
+        matched, _, unmatched = match.partition(c.SNIPPET_END)
+        text.append(matched, style=SNIPPET_STYLE)
+        text.append(unmatched)
+    return text
 
-def open_file(console: Console, doc_id: int) -> Optional[str]:
 
-    docs = Document.select().where(Document.id == doc_id).execute()
-    if not docs:
-        return None
-    doc = docs[0]
+def open_file(console: Console, result: QueryResult) -> Optional[str]:
+    """Show the query result's file and (if confirmed) open it; everything we
+    need is on the result already so no need to go back to the database."""
 
     # Display information about the file..
-    path_ = Path(doc.path)
+    path_ = result.path_full
     stat_ = os.stat(path_)
     size_ = stat_.st_size
 
-    console.print(f"   {'Doc Id':16s} {doc.id}")
-    console.print(f"   {'Path':16s} {path_.parent}")
-    console.print(f"   {'File':16s} {path_.name}")
-    console.print(f"   {'Last Modified':16s} {doc.last_mod}")
-    console.print(f"   {'Size':16s} {humanify_size(size_)}")
+    with console:
+        console.print(f"   {'Doc Id':16s} {result.doc_id}")
+        console.print(f"   {'Path':16s} {path_.parent}")
+        console.print(f"   {'File':16s} {path_.name}")
+        console.print(f"   {'Last Modified':16s} {result.last_mod}")
+        console.print(f"   {'Size':16s} {humanify_size(size_)}")
 
     # Confirm that we want to open it!
     yes_no_other = Prompt.ask("Open this file (y/[b]n[/b])?")
     if yes_no_other and yes_no_other.lower().startswith("y"):
+        _open_with_os(path_)
         return f"Opening file: [b]{path_.name}..."
-        os.system(f'open "{path_}"')
     return None
+
+
+def _open_with_os(path_: Path) -> None:
+    """Hand the file off to the OS' default application for it, without
+    going through a shell and without waiting for the application to return."""
+    if sys.platform == "win32":
+        os.startfile(path_)
+        return
+    opener = "open" if sys.platform == "darwin" else "xdg-open"
+    subprocess.Popen(
+        [opener, os.fspath(path_)],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True)
@@ -18,17 +18,37 @@ def command(console: Console, verbose: bool) -> None:
         console.print("[bold italic]No[/bold italic] documents have been indexed yet, database is empty.")
         return
 
+    # Not going to a terminal (eg. piped), no need to lay out a table..
+    if not console.is_terminal:
+        _print_plain(console, status)
+        return
+
     # Documents...
     table = Table(show_header=True, show_footer=True, box=c.DEFAULT_BOX_STYLE)
     table.add_column("Suffix", footer=Text("Total"))
     table.add_column("Documents", footer=Text(f"{status.total_docs:,d}"), justify="right")
-    for (suffix, count) in status.suffix_counts.items():
-        table.add_row(suffix, f"{count:,d}")
-    console.print(table)
+    rows = [(suffix, f"{count:,d}") for (suffix, count) in status.suffix_counts.items()]
+    for row in rows:
+        table.add_row(*row)
 
-    if status.total_tags:
-        console.print(f"Total tags  : [bold]{status.total_tags:,d}[/bold]")
+    with console:   # Buffer all our output and write it out at once.
+        console.print(table)
+
+        if status.total_tags:
+            console.print(f"Total tags  : [bold]{status.total_tags:,d}[/bold]")
 
-    # Links...
+        # Links...
+        if status.total_links:
+            console.print(f"Total links : [bold]{status.total_links:,d}[/bold]")
+
+
+def _print_plain(console: Console, status) -> None:
+    """Write the status as plain lines, in one write, for scripted use."""
+    width = max(map(len, [*status.suffix_counts, "Total"]))
+    lines = [f"{suffix:{width}s} {count:>10,d}" for (suffix, count) in status.suffix_counts.items()]
+    lines.append(f"{'Total':{width}s} {status.total_docs:>10,d}")
+    if status.total_tags:
+        lines.append(f"Total tags  : {status.total_tags:,d}")
     if status.total_links:
-        console.print(f"Total links : [bold]{status.total_links:,d}[/bold]")
+        lines.append(f"Total links : {status.total_links:,d}")
+    console.file.write("\n".join(lines) + "\n")
@@ -17,6 +17,7 @@ def command(console: Console, verbose: bool) -> None:
         table = Table(show_header=True, show_footer=True, box=c.DEFAULT_BOX_STYLE)
         table.add_column("Tag")
         table.add_column("Documents")
-        for dt_ in tag_counts:
-            table.add_row(dt_.tag, f"{dt_.COUNT:,d}")
+        rows = [(dt_.tag, f"{dt_.COUNT:,d}") for dt_ in tag_counts]
+        for row in rows:
+            table.add_row(*row)
         console.print(table)
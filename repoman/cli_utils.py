@@ -1,13 +1,22 @@
+import atexit
+import datetime
+import os
+import stat
+import threading
+from contextlib import suppress
+from functools import lru_cache
 from pathlib import Path
+from queue import SimpleQueue, Empty
 from typing import Any
 
 import nestedtext as nt
-from prompt_toolkit import prompt
+from prompt_toolkit import PromptSession
+from prompt_toolkit.history import FileHistory
 from prompt_toolkit.validation import Validator, ValidationError
 
 import constants as c
 from utils import AnonymousObj
-from adts import SortOrderChoices, IndexCommandParameters, QueryCommandParameters
+from adts import SortOrderChoices, SORT_ORDER_CHOICES, IndexCommandParameters, QueryCommandParameters
 
 
 ################################################################################
@@ -18,7 +27,53 @@ def sub_prompt(prompt_: str, default_: str, *args, **kwargs) -> str:
     if 'length' in kwargs:
         len_ = kwargs.get('length', 14)
         del kwargs['length']
-    return prompt(f"{prompt_:{len_}s} > ", default=default_, *args, **kwargs)
+    session = _sub_prompt_session(prompt_)
+    return session.prompt(f"{prompt_:{len_}s} > ", default=default_, *args, **kwargs)
+
+
+@lru_cache(maxsize=None)
+def _sub_prompt_session(prompt_: str) -> PromptSession:
+    """Reuse a session per sub-prompt rather than prompt() building a new one every
+    call (per sub-prompt as a session keeps any completer/validator it's given)."""
+    return PromptSession()
+
+
+class BufferedFileHistory(FileHistory):
+    """A prompt_toolkit FileHistory that doesn't write to the history file on the
+    prompt's thread, instead, a background thread appends whatever's pending in
+    one go (and anything still pending is written when we exit).
+    """
+    def __init__(self, filename) -> None:
+        super().__init__(filename)
+        self._pending = SimpleQueue()        # (when entered, string) tuples
+        self._has_pending = threading.Event()
+        self._write_lock = threading.Lock()
+        threading.Thread(target=self._writer, daemon=True).start()
+        atexit.register(self.flush)
+
+    def store_string(self, string: str) -> None:
+        self._pending.put((datetime.datetime.now(), string))
+        self._has_pending.set()
+
+    def flush(self) -> None:
+        """Write out everything that's pending (in the same format as FileHistory)"""
+        with self._write_lock:
+            entries = []
+            with suppress(Empty):
+                while True:
+                    entries.append(self._pending.get_nowait())
+            if not entries:
+                return
+            with open(self.filename, "ab") as fh_:
+                for (when, string) in entries:
+                    lines = "".join(f"+{line}\n" for line in string.split("\n"))
+                    fh_.write(f"\n# {when}\n{lines}".encode("utf-8"))
+
+    def _writer(self) -> None:
+        while True:
+            self._has_pending.wait()
+            self._has_pending.clear()
+            self.flush()
 
 
 ################################################################################
@@ -29,13 +84,22 @@ STATE_TYPES = dict(
     query = QueryCommandParameters,
 )
 
+# State as we last read/wrote it, by command: (mtime_ns of the state file, state dict)
+STATE_CACHE: dict[str, tuple[int, dict]] = {}
+
 def get_state(command: str) -> AnonymousObj:
     type_ = STATE_TYPES[command]
     path_ = _get_state_path(command)
-    if path_.exists:
-        state = nt.load(path_, top='dict')
-        return type_(**state)
-    return type_()        # Pick up default values from ADT definition
+    try:
+        mtime = path_.stat().st_mtime_ns
+    except FileNotFoundError:
+        return type_()    # Pick up default values from ADT definition
+
+    # Only (re)parse the state file if it's changed since we last saw it.
+    cached = STATE_CACHE.get(command)
+    if cached is None or cached[0] != mtime:
+        cached = STATE_CACHE[command] = (mtime, nt.load(path_, top='dict'))
+    return type_(**cached[1])
 
 
 def save_state(command: str, state: AnonymousObj) -> bool:
@@ -45,6 +109,7 @@ def save_state(command: str, state: AnonymousObj) -> bool:
     except nt.NestedTextError as err:
         err.terminate()
         return False
+    STATE_CACHE[command] = (path_.stat().st_mtime_ns, dict(state.__dict__))
     return True
 
 
@@ -55,8 +120,9 @@ def update_state(command: str, attribute: str, new_value: Any) -> None:
     save_state(command, state)
 
 
-def _get_state_path(command):
-    return c.REPOMAN_PATH / Path(f"{c.STATE_ROOT}.{command}")
+@lru_cache(maxsize=None)  # One path per command, fixed for the session.
+def _get_state_path(command: str) -> Path:
+    return c.REPOMAN_PATH / f"{c.STATE_ROOT}.{command}"
 
 
 ################################################################################
@@ -64,10 +130,12 @@ def _get_state_path(command):
 ################################################################################
 class PathValidator(Validator):
     def validate(self, document):
-        path = Path(document.text)
-        if not path.exists():
+        # Runs on every edit, so only one stat call (not .exists() *and* .is_dir())
+        try:
+            mode = os.stat(os.path.expanduser(document.text or ".")).st_mode  # (as Path("") would be)
+        except (OSError, ValueError):
             raise ValidationError(message="Sorry, this path doesn't exist")
-        if not path.is_dir():
+        if not stat.S_ISDIR(mode):
             raise ValidationError(message="Sorry, this path isn't a directory")
 
 
@@ -14,6 +14,11 @@ if not REPOMAN_PATH.exists():
 DB_PATH = REPOMAN_PATH / Path(REPOMAN_DB)
 DB_DATETIME_FORMAT = '%Y-%m-%d %H:%M'
 
+# Delimiters around matching text in query snippets (control characters so that
+# they can't be confused with anything in an indexed document, eg. ">>>").
+SNIPPET_START = "\x02"
+SNIPPET_END   = "\x03"
+
 # Indexing constants:
 SKIP_DIRS = (
     # Directories to SKIP indexing on..
@@ -42,6 +47,17 @@ INCLUDE_EXTENSIONS = (
 )
 
 # CLI UI support constants:
+
+# Pre-rendered from pyfiglet: Figlet(font='standard').renderText('Repo-Man')
+BANNER = r"""
+ ____                        __  __
+|  _ \ ___ _ __   ___       |  \/  | __ _ _ __
+| |_) / _ \ '_ \ / _ \ _____| |\/| |/ _` | '_ \
+|  _ <  __/ |_) | (_) |_____| |  | | (_| | | | |
+|_| \_\___| .__/ \___/      |_|  |_|\__,_|_| |_|
+          |_|
+"""[1:]
+
 def _italic(str_):
     return f"[italic]{str_}[/italic]"
 
@@ -49,3 +65,8 @@ INTRODUCTION = f"""Welcome to RepoMan!
 {_italic('Ctrl-D')} or {_italic('.exit')}/{_italic('.quit')} to exit, {_italic('.help')} for help."""
 
 PROMPT = 'repoman> '
+
+MAX_QUERY_RESULTS = 500  # Most query results we'll display (and page through)
+
+EXIT_COMMANDS = frozenset((".exit", ".quit"))
+EXIT_COMMAND_MAX_LEN = max(map(len, EXIT_COMMANDS))
@@ -10,7 +10,7 @@ from db_physical import database, get_db_connection, drop
 
 class Document(Model):
     path     = CharField    (index=True) # Here as primary key, also stored below for search
-    suffix   = CharField    (index=False, null=True)
+    suffix   = CharField    (index=True, null=True)  # For status' GROUP BY suffix
     last_mod = DateTimeField(index=False, formats=(c.DB_DATETIME_FORMAT,))
     last_idx = DateTimeField(index=False, formats=(c.DB_DATETIME_FORMAT,), default=datetime.datetime.now)
 
@@ -32,7 +32,7 @@ class DocumentFTS(FTS5Model):
 
 class DocumentTag(Model):
     doc_id = ForeignKeyField(Document, backref="tags")
-    tag = CharField()
+    tag = CharField(index=True)  # Queries look up tags directly
 
     class Meta:
         database   = database
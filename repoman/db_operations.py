@@ -1,13 +1,13 @@
 # All methods for interfacing with and managing the SQLite database.
 import sys
 from collections import defaultdict
+from functools import lru_cache
 from pathlib import Path
 from peewee import OperationalError
 from sqlite3 import connect, Connection  # typing...
-from typing import List, Dict, Tuple
+from typing import Dict, Iterable, List, Tuple
 from urllib.parse import urlparse
 
-from pdfminer.pdfparser import PDFSyntaxError
 from peewee import fn
 
 import constants as c
@@ -20,74 +20,100 @@ from adts import QueryResult, QueryCommandParameters
 # Core database operations
 ################################################################################
 def query(query_parms: QueryCommandParameters) -> list[QueryResult]:
+    """Query docs based on the query string (and suffix, if any), as a new list
+    (the results themselves are cached, see clear_query_cache)."""
+    return list(_query(query_parms.query_string, query_parms.suffix.lower()))
 
-    def _get_docs_by_id(query_parms: QueryCommandParameters, doc_ids: list[int]) -> dict[int, Document]:
+
+def clear_query_cache() -> None:
+    """Anything that changes the documents indexed needs to call this!"""
+    _query.cache_clear()
+
+
+@lru_cache(maxsize=64)
+def _query(query_string: str, suffix: str) -> tuple[QueryResult, ...]:
+    # Only the query string and suffix matter here (and they're hashable, unlike the parms).
+    query_parms = QueryCommandParameters(query_string=query_string, suffix=suffix)
+
+    def _limit_to_suffix(query_parms: QueryCommandParameters, query):
+        """Limit the query to documents of the suffix requested (if any), so that
+        the filtering is done by the database rather than on our side."""
+        if query_parms.suffix:
+            query = query.where(fn.LOWER(Document.suffix) == query_parms.suffix)
+        return query
+
+    def _get_docs_by_id(query_parms: QueryCommandParameters, doc_ids: Iterable[int]) -> dict[int, tuple]:
+        """Return (path, suffix, last_mod) for each of the doc ids requested (by doc id)"""
         docs = (Document
-                .select()
+                .select(Document.id, Document.path, Document.suffix, Document.last_mod)
                 .where(Document.id.in_(doc_ids)))
-        return {doc.id : doc for doc in docs}
+        docs = _limit_to_suffix(query_parms, docs).tuples()
+        return {doc_id : rest for (doc_id, *rest) in docs}
 
 
     def get_docs_from_fts(query_parms: QueryCommandParameters) -> list[QueryResult]:
 
+        # Get the matching document definitions along with the FTS matches in one go and
+        # stream them (only the columns we need, in particular *not* the body of every document).
         ftss = (DocumentFTS
                 .search_bm25(query_parms.query_string)
                 .select(
-                    DocumentFTS,
+                    DocumentFTS.rowid,
                     DocumentFTS.bm25().alias('bm25'),
-                    DocumentFTS.body.snippet('>>>', '<<<', max_tokens=5).alias('snippet'))
-                .order_by(DocumentFTS.bm25().desc())
-                )
-        doc_ids = [doc.rowid for doc in ftss]
-
-        # Now, get the matching document definitions..
-        docs = _get_docs_by_id(query_parms, doc_ids)
-
-        # And laminate them both together..
-        return_ = list()
-        for fts in ftss:
-            doc = docs.get(fts.rowid)
-            if not doc:
-                continue
-            doc_path = Path(doc.path)
+                    DocumentFTS.body.snippet(c.SNIPPET_START, c.SNIPPET_END, max_tokens=5).alias('snippet'),
+                    Document.path,
+                    Document.suffix,
+                    Document.last_mod)
+                .join(Document, on=(Document.id == DocumentFTS.rowid))
+                .order_by(DocumentFTS.bm25().desc()))
+        ftss = _limit_to_suffix(query_parms, ftss).tuples().iterator()
+
+        return_, doc_ids = list(), set()
+        for (rowid, bm25, snippet, path, suffix, last_mod) in ftss:
+            doc_ids.add(rowid)
+            doc_path = Path(path)
             ao_doc = QueryResult(
-                doc_id    = doc.id,
-                rank      = f"{fts.bm25:.2f}",
+                doc_id    = rowid,
+                rank      = f"{bm25:.2f}",
                 path_full = doc_path,
                 name      = doc_path.name,
                 path_rel  = str(doc_path.relative_to(*doc_path.parts[:3])), # FIXME! Won't always be 3!!
-                suffix    = doc.suffix,
-                last_mod  = doc.last_mod,
-                snippet   = fts.snippet,
+                suffix    = suffix,
+                last_mod  = last_mod,
+                snippet   = snippet,
             )
             return_.append(ao_doc)
 
         return return_, doc_ids
 
-    def get_docs_from_tags(doc_ids: list[int], query_parms: QueryCommandParameters) -> List[QueryResult]:
+    def get_docs_from_tags(doc_ids: set[int], query_parms: QueryCommandParameters) -> List[QueryResult]:
 
-        query = DocumentTag.select(DocumentTag.doc_id).where(DocumentTag.tag == query_parms.query_string)
-        if not query:
-            return []
+        # (as plain ids, accessing .doc_id on a model instance would fetch each Document!)
+        query = (DocumentTag
+                 .select(DocumentTag.doc_id)
+                 .where(DocumentTag.tag == query_parms.query_string)
+                 .tuples())
 
         # Fast depup against what we've already queried from regular FTS search..
-        tag_doc_ids = {dt_.doc_id for dt_ in query if dt_.doc_id not in doc_ids}
+        tag_doc_ids = {doc_id for (doc_id,) in query if doc_id not in doc_ids}
+        if not tag_doc_ids:
+            return []
 
         # Now, get the matching document definitions..
         docs = _get_docs_by_id(query_parms, tag_doc_ids)
 
         return_ = list()
-        for doc in docs.values():
-            doc_path = Path(doc.path)
+        for doc_id, (path, suffix, last_mod) in docs.items():
+            doc_path = Path(path)
             ao_doc = QueryResult(
-                doc_id    = None,
+                doc_id    = doc_id,
                 rank      = f" 0.00",
                 path_full = doc_path,
                 name      = doc_path.name,
                 path_rel  = str(doc_path.relative_to(*doc_path.parts[:3])),
-                suffix    = doc.suffix,
-                last_mod  = doc.last_mod,
-                snippet   = f"Tag: >>>{query_parms.query_string}<<<",
+                suffix    = suffix,
+                last_mod  = last_mod,
+                snippet   = f"Tag: {c.SNIPPET_START}{query_parms.query_string}{c.SNIPPET_END}",
             )
             return_.append(ao_doc)
         return return_
@@ -98,7 +124,7 @@ def query(query_parms: QueryCommandParameters) -> list[QueryResult]:
     docs_from_fts, doc_ids = get_docs_from_fts (query_parms)
     docs_from_tags         = get_docs_from_tags(doc_ids, query_parms)
 
-    return docs_from_tags + docs_from_fts
+    return tuple(docs_from_tags + docs_from_fts)
 
 
 ################################################################################
@@ -188,14 +214,13 @@ def status() -> AnonymousObj:
     # Documents...
     return_.total_docs = Document.select().count()
 
-    # FIXME: How to do this in peewee?
-    #     query = """SELECT suffix, count(*)
-    #                  FROM document
-    #              GROUP BY suffix
-    #              ORDER BY count(*) DESC"""
-    return_.suffix_counts = defaultdict(int)
-    for doc in Document.select(Document.suffix):
-        return_.suffix_counts[doc.suffix] += 1
+    # Let the database do the counting (most common suffix first)..
+    count = fn.COUNT(Document.id)
+    return_.suffix_counts = dict(Document
+                                 .select(Document.suffix, count)
+                                 .group_by(Document.suffix)
+                                 .order_by(count.desc())
+                                 .tuples())
 
     # Tags...
     return_.total_tags = DocumentTag.select().count()
@@ -0,0 +1,21 @@
+import pytest
+
+from cli import get_module_for_command
+
+
+################################################################################
+# Make sure that commands resolve by name, alias and unambiguous prefix only.
+################################################################################
+COMMANDS = (
+    ("status", "cli_commands.status"),
+    ("st",     "cli_commands.status"),
+    ("q",      "cli_commands.query"),
+    ("qu",     "cli_commands.query"),
+    ("db_d",   "cli_commands.db_drop"),
+    ("db",     None),               # Ambiguous: db_clear, db_create, db_drop
+    ("nope",   None),
+)
+@pytest.mark.parametrize("command,module_name", COMMANDS)
+def test_get_module_for_command(command, module_name):
+    module_ = get_module_for_command(command)
+    assert (module_.__name__ if module_ else None) == module_name
@@ -0,0 +1,49 @@
+import os
+
+import nestedtext as nt
+from prompt_toolkit.history import FileHistory
+
+import cli_utils
+from cli_utils import BufferedFileHistory, get_state, update_state
+
+
+################################################################################
+# Make sure that our buffered history writes exactly what FileHistory would.
+################################################################################
+HISTORY_STRINGS = ("one", "two\nlines", "three")
+
+def test_buffered_file_history(tmp_path):
+    buffered, plain = tmp_path / "buffered", tmp_path / "plain"
+
+    history = BufferedFileHistory(buffered)
+    for string in HISTORY_STRINGS:
+        history.store_string(string)
+        FileHistory(plain).store_string(string)
+    history.flush()
+
+    assert list(FileHistory(buffered).load_history_strings()) == \
+           list(FileHistory(plain).load_history_strings())
+
+
+################################################################################
+# Make sure that cached state reflects what's on disk, no matter who wrote it.
+################################################################################
+def test_state_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(cli_utils, "_get_state_path", lambda command: tmp_path / f"state.{command}")
+    monkeypatch.setattr(cli_utils, "STATE_CACHE", {})
+
+    assert get_state("query").query_string == ""
+
+    update_state("query", "query_string", "first")
+    assert get_state("query").query_string == "first"
+
+    # Changes we make to the state returned mustn't leak into the cache.
+    state = get_state("query")
+    state.query_string = "changed"
+    assert get_state("query").query_string == "first"
+
+    # Written by someone else (ie. without going through save_state)..
+    state.query_string = "second"
+    nt.dump(state.__dict__, tmp_path / "state.query")
+    os.utime(tmp_path / "state.query", ns=(0, 0))
+    assert get_state("query").query_string == "second"
@@ -0,0 +1,45 @@
+import pytest
+
+import constants as c
+from adts import QueryCommandParameters, QueryResult
+from cli_commands.query import markup_snippet, SNIPPET_STYLE, _sort_results
+
+
+################################################################################
+# Make sure that FTS5 snippet delimiters are converted to styled Text (and that
+# anything looking like Rich markup in the text is left alone).
+################################################################################
+S, E = c.SNIPPET_START, c.SNIPPET_END
+SNIPPETS = (
+    ("no matches here",
+     "no matches here", []),
+    (f"a {S}match{E} here",
+     "a match here", ["match"]),
+    (f"{S}one{E} and {S}two{E}",
+     "one and two", ["one", "two"]),
+    (f"[bold]not markup[/bold] >>> {S}x{E}",
+     "[bold]not markup[/bold] >>> x", ["x"]),
+)
+@pytest.mark.parametrize("snippet,plain,matches", SNIPPETS)
+def test_markup_snippet(snippet, plain, matches):
+    text = markup_snippet(snippet)
+    assert text.plain == plain
+    assert [text.plain[span.start:span.end] for span in text.spans] == matches
+    assert all(span.style == SNIPPET_STYLE for span in text.spans)
+
+
+################################################################################
+# Make sure that only sorting the "top" of the results (when there are more
+# than we can show) gives the same results as sorting all of them.
+################################################################################
+RESULTS = [
+    QueryResult(doc_id=i, rank=f"{-(i % 7):.2f}", name=f"doc{i % 13}", path_full=f"/d/doc{i}",
+                path_rel=f"doc{i}", suffix="txt", last_mod=f"2021-01-{i % 28 + 1:02d}", snippet="")
+    for i in range(100)
+]
+@pytest.mark.parametrize("sort_order", ("lastmod", "-lastmod", "name", "-name", "rank", "-rank"))
+@pytest.mark.parametrize("limit", (10, 100, 200))
+def test_sort_results(sort_order, limit):
+    query_parms = QueryCommandParameters(sort_order=sort_order)
+    everything = _sort_results(query_parms, list(RESULTS), len(RESULTS))
+    assert _sort_results(query_parms, list(RESULTS), limit) == everything[:limit]
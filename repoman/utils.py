@@ -1,10 +1,11 @@
 import sys                      # Mostly to flush stdout..
 import time
 from pathlib import Path
-from functools import wraps
+from functools import lru_cache, wraps
 from typing import Callable
 
 
+@lru_cache(maxsize=1)  # Only needs creating (if necessary) once per process.
 def get_user_history_path():
     history_path = Path("~/.config/repoman").expanduser()
     history_path.mkdir(parents=True, exist_ok=True)